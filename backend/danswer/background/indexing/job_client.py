@@ -4,8 +4,11 @@ not follow the expected behavior, etc.
 
 NOTE: cannot use Celery directly due to
 https://github.com/celery/celery/issues/7007#issuecomment-1740139367"""
+import threading
 from collections.abc import Callable
+from collections.abc import Iterable
 from dataclasses import dataclass
+from multiprocessing.connection import wait
 from typing import Any
 from typing import Literal
 
@@ -55,11 +58,26 @@ class SimpleJob:
             return "finished"
 
     def done(self) -> bool:
-        return (
-            self.status == "finished"
-            or self.status == "cancelled"
-            or self.status == "error"
-        )
+        # `status` polls the underlying process, so only compute it once
+        status = self.status
+        return status == "finished" or status == "cancelled" or status == "error"
+
+    def add_done_callback(self, fn: Callable[["SimpleJob"], Any]) -> None:
+        """Matches the Dask API, `fn` is called from a background thread once the
+        underlying process exits"""
+        if self.process is None:
+            fn(self)
+            return
+
+        def _wait_and_call(sentinel: int) -> None:
+            # waits on the sentinel rather than `join` so the process isn't reaped
+            # from this thread while the main thread is polling it
+            wait([sentinel])
+            fn(self)
+
+        threading.Thread(
+            target=_wait_and_call, args=(self.process.sentinel,), daemon=True
+        ).start()
 
     def exception(self) -> str:
         """Needed to match the Dask API, but not implemented since we don't currently
@@ -102,3 +120,9 @@ class SimpleJobClient:
         self.jobs[job_id] = job
 
         return job
+
+    def map(
+        self, func: Callable, *iterables: Iterable[Any], pure: bool = True
+    ) -> list[SimpleJob | None]:
+        """NOTE: `pure` arg is needed so this can be a drop in replacement for Dask"""
+        return [self.submit(func, *args, pure=pure) for args in zip(*iterables)]
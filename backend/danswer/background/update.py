@@ -1,5 +1,9 @@
+import functools
 import logging
+import threading
 import time
+from collections import defaultdict
+from collections.abc import Callable
 from datetime import datetime
 
 import dask
@@ -23,6 +27,10 @@ from danswer.db.connector_credential_pair import get_connector_credential_pairs
 from danswer.db.connector_credential_pair import mark_all_in_progress_cc_pairs_failed
 from danswer.db.connector_credential_pair import resync_cc_pair
 from danswer.db.connector_credential_pair import update_connector_credential_pair
+from danswer.db.connector_credential_pair import (
+    update_connector_credential_pair_statuses__no_commit,
+)
+from danswer.db.embedding_model import get_active_embedding_models
 from danswer.db.embedding_model import get_current_db_embedding_model
 from danswer.db.embedding_model import get_secondary_db_embedding_model
 from danswer.db.embedding_model import update_embedding_model_status
@@ -31,10 +39,12 @@ from danswer.db.engine import get_sqlalchemy_engine
 from danswer.db.index_attempt import count_unique_cc_pairs_with_index_attempts
 from danswer.db.index_attempt import create_index_attempt
 from danswer.db.index_attempt import get_index_attempt
+from danswer.db.index_attempt import get_index_attempts_by_ids
 from danswer.db.index_attempt import get_inprogress_index_attempts
-from danswer.db.index_attempt import get_last_attempt
+from danswer.db.index_attempt import get_last_attempts_bulk
 from danswer.db.index_attempt import get_not_started_index_attempts
-from danswer.db.index_attempt import mark_attempt_failed
+from danswer.db.index_attempt import has_pending_or_due_indexing
+from danswer.db.index_attempt import mark_attempts_failed
 from danswer.db.models import Connector
 from danswer.db.models import EmbeddingModel
 from danswer.db.models import IndexAttempt
@@ -52,13 +62,20 @@ _UNEXPECTED_STATE_FAILURE_REASON = (
     "Stopped mid run, likely due to the background process being killed"
 )
 
+_FINISHED_STATUSES = frozenset({IndexingStatus.FAILED, IndexingStatus.SUCCESS})
+
+# Same as what `done()` checks for on both Dask futures and `SimpleJob`s
+_DONE_JOB_STATUSES = frozenset({"finished", "cancelled", "error"})
+
 
 """Util funcs"""
 
 
+@functools.cache
 def _get_num_threads() -> int:
     """Get # of "threads" to use for ML models in an indexing job. By default uses
     the torch implementation, which returns the # of physical cores on the machine.
+    Cached since this does not change while running.
     """
     return max(MIN_THREADS_ML_MODELS, torch.get_num_threads())
 
@@ -67,7 +84,7 @@ def _should_create_new_indexing(
     connector: Connector,
     last_index: IndexAttempt | None,
     model: EmbeddingModel,
-    db_session: Session,
+    current_db_time: datetime,
 ) -> bool:
     # When switching over models, always index at least once
     if model.status == IndexModelStatus.FUTURE and not last_index:
@@ -94,7 +111,6 @@ def _should_create_new_indexing(
     if last_index.status == IndexingStatus.NOT_STARTED:
         return False
 
-    current_db_time = get_db_current_time(db_session)
     time_since_index = current_db_time - last_index.time_updated
     return time_since_index.total_seconds() >= connector.refresh_freq
 
@@ -103,203 +119,252 @@ def _is_indexing_job_marked_as_finished(index_attempt: IndexAttempt | None) -> b
     if index_attempt is None:
         return False
 
-    return (
-        index_attempt.status == IndexingStatus.FAILED
-        or index_attempt.status == IndexingStatus.SUCCESS
-    )
+    return index_attempt.status in _FINISHED_STATUSES
 
 
-def _mark_run_failed(
-    db_session: Session, index_attempt: IndexAttempt, failure_reason: str
+def _snapshot_job_states(
+    jobs: dict[int, Future | SimpleJob]
+) -> dict[int, tuple[str, bool]]:
+    """Grabs the (status, done) of every job up front so that the cleanup pass works
+    off of a single consistent view rather than re-polling each job as it goes. `done`
+    is derived from the status so that the two can never disagree"""
+    job_states: dict[int, tuple[str, bool]] = {}
+    for attempt_id, job in jobs.items():
+        status = job.status
+        job_states[attempt_id] = (status, status in _DONE_JOB_STATUSES)
+    return job_states
+
+
+def _mark_runs_failed(
+    db_session: Session, failed_attempts: dict[int, tuple[IndexAttempt, str]]
 ) -> None:
-    """Marks the `index_attempt` row as failed + updates the `
-    connector_credential_pair` to reflect that the run failed"""
-    logger.warning(
-        f"Marking in-progress attempt 'connector: {index_attempt.connector_id}, "
-        f"credential: {index_attempt.credential_id}' as failed due to {failure_reason}"
-    )
-    mark_attempt_failed(
-        index_attempt=index_attempt,
+    """Marks the `index_attempt` rows as failed + updates the
+    `connector_credential_pair`s to reflect that the runs failed"""
+    if not failed_attempts:
+        return
+
+    cc_pair_ids: set[tuple[int, int]] = set()
+    for index_attempt, failure_reason in failed_attempts.values():
+        logger.warning(
+            f"Marking in-progress attempt 'connector: {index_attempt.connector_id}, "
+            f"credential: {index_attempt.credential_id}' as failed due to "
+            f"{failure_reason}"
+        )
+        if (
+            index_attempt.connector_id is not None
+            and index_attempt.credential_id is not None
+            and index_attempt.embedding_model.status == IndexModelStatus.PRESENT
+        ):
+            cc_pair_ids.add((index_attempt.connector_id, index_attempt.credential_id))
+
+    # committed along with the attempts below
+    update_connector_credential_pair_statuses__no_commit(
+        connector_credential_ids=list(cc_pair_ids),
+        attempt_status=IndexingStatus.FAILED,
         db_session=db_session,
-        failure_reason=failure_reason,
     )
-    if (
-        index_attempt.connector_id is not None
-        and index_attempt.credential_id is not None
-        and index_attempt.embedding_model.status == IndexModelStatus.PRESENT
-    ):
-        update_connector_credential_pair(
-            db_session=db_session,
-            connector_id=index_attempt.connector_id,
-            credential_id=index_attempt.credential_id,
-            attempt_status=IndexingStatus.FAILED,
+    mark_attempts_failed(list(failed_attempts.values()), db_session)
+
+
+def _start_secondary_client(num_workers: int) -> Client | SimpleJobClient:
+    """The secondary index is only built while switching over embedding models, so its
+    workers are started on demand rather than sitting idle the rest of the time"""
+    if DASK_JOB_CLIENT_ENABLED:
+        cluster_secondary = LocalCluster(
+            n_workers=num_workers,
+            threads_per_worker=1,
+            silence_logs=logging.ERROR,
         )
+        return Client(cluster_secondary)
+    return SimpleJobClient(n_workers=num_workers)
 
 
 """Main funcs"""
 
 
-def create_indexing_jobs(existing_jobs: dict[int, Future | SimpleJob]) -> None:
+def create_indexing_jobs(
+    existing_jobs: dict[int, Future | SimpleJob], db_session: Session
+) -> None:
     """Creates new indexing jobs for each connector / credential pair which is:
     1. Enabled
     2. `refresh_frequency` time has passed since the last indexing run for this pair
     3. There is not already an ongoing indexing attempt for this pair
     """
-    with Session(get_sqlalchemy_engine()) as db_session:
-        ongoing: set[tuple[int | None, int | None, int]] = set()
-        for attempt_id in existing_jobs:
-            attempt = get_index_attempt(
-                db_session=db_session, index_attempt_id=attempt_id
-            )
-            if attempt is None:
-                logger.error(
-                    f"Unable to find IndexAttempt for ID '{attempt_id}' when creating "
-                    "indexing jobs"
-                )
-                continue
-            ongoing.add(
-                (
-                    attempt.connector_id,
-                    attempt.credential_id,
-                    attempt.embedding_model_id,
-                )
-            )
-
-        embedding_models = [get_current_db_embedding_model(db_session)]
-        secondary_embedding_model = get_secondary_db_embedding_model(db_session)
-        if secondary_embedding_model is not None:
-            embedding_models.append(secondary_embedding_model)
-
-        all_connectors = fetch_connectors(db_session)
-        for connector in all_connectors:
-            for association in connector.credentials:
-                for model in embedding_models:
-                    credential = association.credential
+    attempt_rows = get_index_attempts_by_ids(
+        index_attempt_ids=list(existing_jobs), db_session=db_session
+    )
+    missing_attempt_ids = set(existing_jobs) - {row[0] for row in attempt_rows}
+    for attempt_id in missing_attempt_ids:
+        logger.error(
+            f"Unable to find IndexAttempt for ID '{attempt_id}' when creating "
+            "indexing jobs"
+        )
 
-                    # Check if there is an ongoing indexing attempt for this connector + credential pair
-                    if (connector.id, credential.id, model.id) in ongoing:
-                        continue
+    ongoing: set[tuple[int | None, int | None, int]] = {
+        (connector_id, credential_id, embedding_model_id)
+        for _, connector_id, credential_id, embedding_model_id in attempt_rows
+    }
+
+    embedding_models = get_active_embedding_models(db_session)
+
+    all_connectors = fetch_connectors(db_session, eager_load_credentials=True)
+    # Skip any connector + credential pair that already has an ongoing indexing attempt
+    candidates = [
+        (connector, association.credential_id, model)
+        for connector in all_connectors
+        for association in connector.credentials
+        for model in embedding_models
+        if (connector.id, association.credential_id, model.id) not in ongoing
+    ]
+    last_attempts = get_last_attempts_bulk(
+        connector_credential_model_ids=[
+            (connector.id, credential_id, model.id)
+            for connector, credential_id, model in candidates
+        ],
+        db_session=db_session,
+    )
 
-                    last_attempt = get_last_attempt(
-                        connector.id, credential.id, model.id, db_session
-                    )
-                    if not _should_create_new_indexing(
-                        connector, last_attempt, model, db_session
-                    ):
-                        continue
+    # Decide on everything before creating any attempts, the commits below expire the
+    # ORM objects and reading them afterwards would reload them one by one
+    current_db_time = get_db_current_time(db_session)
+    to_create: list[tuple[int, int, int, bool]] = []
+    for connector, credential_id, model in candidates:
+        last_attempt = last_attempts.get((connector.id, credential_id, model.id))
+        if not _should_create_new_indexing(
+            connector, last_attempt, model, current_db_time
+        ):
+            continue
 
-                    create_index_attempt(
-                        connector.id, credential.id, model.id, db_session
-                    )
+        to_create.append(
+            (
+                connector.id,
+                credential_id,
+                model.id,
+                model.status == IndexModelStatus.PRESENT,
+            )
+        )
 
-                    # CC-Pair will have the status that it should for the primary index
-                    # Will be re-sync-ed once the indices are swapped
-                    if model.status == IndexModelStatus.PRESENT:
-                        update_connector_credential_pair(
-                            db_session=db_session,
-                            connector_id=connector.id,
-                            credential_id=credential.id,
-                            attempt_status=IndexingStatus.NOT_STARTED,
-                        )
+    for connector_id, credential_id, model_id, is_primary in to_create:
+        create_index_attempt(connector_id, credential_id, model_id, db_session)
+
+        # CC-Pair will have the status that it should for the primary index
+        # Will be re-sync-ed once the indices are swapped
+        if is_primary:
+            update_connector_credential_pair(
+                db_session=db_session,
+                connector_id=connector_id,
+                credential_id=credential_id,
+                attempt_status=IndexingStatus.NOT_STARTED,
+            )
 
 
 def cleanup_indexing_jobs(
     existing_jobs: dict[int, Future | SimpleJob],
+    db_session: Session,
     timeout_hours: int = CLEANUP_INDEXING_JOBS_TIMEOUT,
 ) -> dict[int, Future | SimpleJob]:
-    existing_jobs_copy = existing_jobs.copy()
+    # removed once done iterating, since `existing_jobs` is still needed as is below
+    finished_attempt_ids: list[int] = []
+    job_states = _snapshot_job_states(existing_jobs)
+    # attempt id -> (attempt, failure reason), written out together at the end
+    failed_attempts: dict[int, tuple[IndexAttempt, str]] = {}
+
+    for attempt_id, job in existing_jobs.items():
+        index_attempt = get_index_attempt(
+            db_session=db_session, index_attempt_id=attempt_id
+        )
+        job_status, job_done = job_states[attempt_id]
 
-    # clean up completed jobs
-    with Session(get_sqlalchemy_engine()) as db_session:
-        for attempt_id, job in existing_jobs.items():
-            index_attempt = get_index_attempt(
-                db_session=db_session, index_attempt_id=attempt_id
-            )
+        # do nothing for ongoing jobs that haven't been stopped
+        if not job_done and not _is_indexing_job_marked_as_finished(index_attempt):
+            continue
 
-            # do nothing for ongoing jobs that haven't been stopped
-            if not job.done() and not _is_indexing_job_marked_as_finished(
-                index_attempt
-            ):
-                continue
+        if job_status == "error":
+            logger.error(job.exception())
 
-            if job.status == "error":
-                logger.error(job.exception())
+        job.release()
+        finished_attempt_ids.append(attempt_id)
 
-            job.release()
-            del existing_jobs_copy[attempt_id]
+        if not index_attempt:
+            logger.error(
+                f"Unable to find IndexAttempt for ID '{attempt_id}' when cleaning "
+                "up indexing jobs"
+            )
+            continue
 
-            if not index_attempt:
-                logger.error(
-                    f"Unable to find IndexAttempt for ID '{attempt_id}' when cleaning "
-                    "up indexing jobs"
-                )
-                continue
+        if index_attempt.status == IndexingStatus.IN_PROGRESS or job_status == "error":
+            failed_attempts[index_attempt.id] = (
+                index_attempt,
+                _UNEXPECTED_STATE_FAILURE_REASON,
+            )
 
-            if (
-                index_attempt.status == IndexingStatus.IN_PROGRESS
-                or job.status == "error"
-            ):
-                _mark_run_failed(
-                    db_session=db_session,
-                    index_attempt=index_attempt,
-                    failure_reason=_UNEXPECTED_STATE_FAILURE_REASON,
-                )
+    # clean up in-progress jobs that were never completed
+    connectors = fetch_connectors(db_session)
+    in_progress_attempts: dict[int | None, list[IndexAttempt]] = defaultdict(list)
+    for index_attempt in get_inprogress_index_attempts(None, db_session):
+        in_progress_attempts[index_attempt.connector_id].append(index_attempt)
+
+    # only fetched once it is needed, usually there is nothing in progress
+    current_db_time: datetime | None = None
+    for connector in connectors:
+        for index_attempt in in_progress_attempts.get(connector.id, []):
+            if index_attempt.id in failed_attempts:
+                continue
 
-        # clean up in-progress jobs that were never completed
-        connectors = fetch_connectors(db_session)
-        for connector in connectors:
-            in_progress_indexing_attempts = get_inprogress_index_attempts(
-                connector.id, db_session
-            )
-            for index_attempt in in_progress_indexing_attempts:
-                if index_attempt.id in existing_jobs:
-                    # check to see if the job has been updated in last `timeout_hours` hours, if not
-                    # assume it to frozen in some bad state and just mark it as failed. Note: this relies
-                    # on the fact that the `time_updated` field is constantly updated every
-                    # batch of documents indexed
+            if index_attempt.id in existing_jobs:
+                # check to see if the job has been updated in last `timeout_hours` hours, if not
+                # assume it to frozen in some bad state and just mark it as failed. Note: this relies
+                # on the fact that the `time_updated` field is constantly updated every
+                # batch of documents indexed
+                if current_db_time is None:
                     current_db_time = get_db_current_time(db_session=db_session)
-                    time_since_update = current_db_time - index_attempt.time_updated
-                    if time_since_update.total_seconds() > 60 * 60 * timeout_hours:
-                        existing_jobs[index_attempt.id].cancel()
-                        _mark_run_failed(
-                            db_session=db_session,
-                            index_attempt=index_attempt,
-                            failure_reason="Indexing run frozen - no updates in the last three hours. "
-                            "The run will be re-attempted at next scheduled indexing time.",
-                        )
-                else:
-                    # If job isn't known, simply mark it as failed
-                    _mark_run_failed(
-                        db_session=db_session,
-                        index_attempt=index_attempt,
-                        failure_reason=_UNEXPECTED_STATE_FAILURE_REASON,
+                time_since_update = current_db_time - index_attempt.time_updated
+                if time_since_update.total_seconds() > 60 * 60 * timeout_hours:
+                    existing_jobs[index_attempt.id].cancel()
+                    failed_attempts[index_attempt.id] = (
+                        index_attempt,
+                        "Indexing run frozen - no updates in the last three hours. "
+                        "The run will be re-attempted at next scheduled indexing time.",
                     )
+            else:
+                # If job isn't known, simply mark it as failed
+                failed_attempts[index_attempt.id] = (
+                    index_attempt,
+                    _UNEXPECTED_STATE_FAILURE_REASON,
+                )
+
+    _mark_runs_failed(db_session=db_session, failed_attempts=failed_attempts)
 
-    return existing_jobs_copy
+    for attempt_id in finished_attempt_ids:
+        existing_jobs.pop(attempt_id, None)
+
+    return existing_jobs
 
 
 def kickoff_indexing_jobs(
     existing_jobs: dict[int, Future | SimpleJob],
     client: Client | SimpleJobClient,
-    secondary_client: Client | SimpleJobClient,
+    get_secondary_client: Callable[[], Client | SimpleJobClient],
+    db_session: Session,
+    wakeup: threading.Event,
 ) -> dict[int, Future | SimpleJob]:
-    existing_jobs_copy = existing_jobs.copy()
-    engine = get_sqlalchemy_engine()
-
     # Don't include jobs waiting in the Dask queue that just haven't started running
     # Also (rarely) don't include for jobs that started but haven't updated the indexing tables yet
-    with Session(engine) as db_session:
-        new_indexing_attempts = [
-            (attempt, attempt.embedding_model)
-            for attempt in get_not_started_index_attempts(db_session)
-            if attempt.id not in existing_jobs
-        ]
+    new_indexing_attempts = [
+        (attempt, attempt.embedding_model)
+        for attempt in get_not_started_index_attempts(db_session)
+        if attempt.id not in existing_jobs
+    ]
 
     logger.info(f"Found {len(new_indexing_attempts)} new indexing tasks.")
 
     if not new_indexing_attempts:
         return existing_jobs
 
+    # attempts whose connector / credential no longer exist, failed together at the end
+    null_attempts: list[tuple[IndexAttempt, str]] = []
+    primary_attempts: list[IndexAttempt] = []
+    secondary_attempts: list[IndexAttempt] = []
     for attempt, embedding_model in new_indexing_attempts:
         use_secondary_index = (
             embedding_model.status == IndexModelStatus.FUTURE
@@ -310,41 +375,56 @@ def kickoff_indexing_jobs(
             logger.warning(
                 f"Skipping index attempt as Connector has been deleted: {attempt}"
             )
-            with Session(engine) as db_session:
-                mark_attempt_failed(
-                    attempt, db_session, failure_reason="Connector is null"
-                )
+            null_attempts.append((attempt, "Connector is null"))
             continue
         if attempt.credential is None:
             logger.warning(
                 f"Skipping index attempt as Credential has been deleted: {attempt}"
             )
-            with Session(engine) as db_session:
-                mark_attempt_failed(
-                    attempt, db_session, failure_reason="Credential is null"
-                )
+            null_attempts.append((attempt, "Credential is null"))
             continue
 
         if use_secondary_index:
-            run = secondary_client.submit(
-                run_indexing_entrypoint, attempt.id, _get_num_threads(), pure=False
-            )
+            secondary_attempts.append(attempt)
         else:
-            run = client.submit(
-                run_indexing_entrypoint, attempt.id, _get_num_threads(), pure=False
-            )
+            primary_attempts.append(attempt)
+
+    # submit each batch in one go rather than one scheduler call per attempt
+    for attempts, use_secondary_index in (
+        (primary_attempts, False),
+        (secondary_attempts, True),
+    ):
+        if not attempts:
+            continue
+
+        # secondary workers are only started once there is something for them to run
+        job_client = get_secondary_client() if use_secondary_index else client
+        secondary_str = "(secondary index) " if use_secondary_index else ""
+        runs = job_client.map(
+            run_indexing_entrypoint,
+            [attempt.id for attempt in attempts],
+            [_get_num_threads()] * len(attempts),
+            pure=False,
+        )
+        for attempt, run in zip(attempts, runs):
+            if not run:
+                continue
+
+            # wake the update loop as soon as the job finishes so that it can be
+            # cleaned up and the next attempt kicked off without a full delay
+            run.add_done_callback(lambda _: wakeup.set())
 
-        if run:
-            secondary_str = "(secondary index) " if use_secondary_index else ""
             logger.info(
                 f"Kicked off {secondary_str}"
                 f"indexing attempt for connector: '{attempt.connector.name}', "
                 f"with config: '{attempt.connector.connector_specific_config}', and "
                 f"with credentials: '{attempt.credential_id}'"
             )
-            existing_jobs_copy[attempt.id] = run
+            existing_jobs[attempt.id] = run
+
+    mark_attempts_failed(null_attempts, db_session)
 
-    return existing_jobs_copy
+    return existing_jobs
 
 
 def check_index_swap(db_session: Session) -> None:
@@ -388,7 +468,8 @@ def check_index_swap(db_session: Session) -> None:
 
 def update_loop(delay: int = 10, num_workers: int = NUM_INDEXING_WORKERS) -> None:
     client_primary: Client | SimpleJobClient
-    client_secondary: Client | SimpleJobClient
+    # only started once there is a secondary index to build, see `get_secondary_client`
+    client_secondary: Client | SimpleJobClient | None = None
     if DASK_JOB_CLIENT_ENABLED:
         cluster_primary = LocalCluster(
             n_workers=num_workers,
@@ -399,21 +480,21 @@ def update_loop(delay: int = 10, num_workers: int = NUM_INDEXING_WORKERS) -> Non
             # the event loop
             silence_logs=logging.ERROR,
         )
-        cluster_secondary = LocalCluster(
-            n_workers=num_workers,
-            threads_per_worker=1,
-            silence_logs=logging.ERROR,
-        )
         client_primary = Client(cluster_primary)
-        client_secondary = Client(cluster_secondary)
         if LOG_LEVEL.lower() == "debug":
             client_primary.register_worker_plugin(ResourceLogger())
     else:
         client_primary = SimpleJobClient(n_workers=num_workers)
-        client_secondary = SimpleJobClient(n_workers=num_workers)
+
+    def get_secondary_client() -> Client | SimpleJobClient:
+        nonlocal client_secondary
+        if client_secondary is None:
+            client_secondary = _start_secondary_client(num_workers)
+        return client_secondary
 
     existing_jobs: dict[int, Future | SimpleJob] = {}
     engine = get_sqlalchemy_engine()
+    wakeup = threading.Event()
 
     with Session(engine) as db_session:
         # Previous version did not always clean up cc-pairs well leaving some connectors undeleteable
@@ -422,8 +503,10 @@ def update_loop(delay: int = 10, num_workers: int = NUM_INDEXING_WORKERS) -> Non
 
     while True:
         start = time.time()
-        start_time_utc = datetime.utcfromtimestamp(start).strftime("%Y-%m-%d %H:%M:%S")
-        logger.info(f"Running update, current UTC time: {start_time_utc}")
+        logger.info(
+            "Running update, current UTC time: %s",
+            time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(start)),
+        )
 
         if existing_jobs:
             # TODO: make this debug level once the "no jobs are being scheduled" issue is resolved
@@ -433,20 +516,31 @@ def update_loop(delay: int = 10, num_workers: int = NUM_INDEXING_WORKERS) -> Non
             )
 
         try:
-            with Session(get_sqlalchemy_engine()) as db_session:
-                check_index_swap(db_session)
-            existing_jobs = cleanup_indexing_jobs(existing_jobs=existing_jobs)
-            create_indexing_jobs(existing_jobs=existing_jobs)
-            existing_jobs = kickoff_indexing_jobs(
-                existing_jobs=existing_jobs,
-                client=client_primary,
-                secondary_client=client_secondary,
-            )
+            with Session(engine) as db_session:
+                # Skip the full pass if nothing is running, queued or due to be indexed
+                if not existing_jobs and not has_pending_or_due_indexing(db_session):
+                    logger.debug("No indexing work to do, skipping update")
+                else:
+                    check_index_swap(db_session)
+                    existing_jobs = cleanup_indexing_jobs(
+                        existing_jobs=existing_jobs, db_session=db_session
+                    )
+                    create_indexing_jobs(
+                        existing_jobs=existing_jobs, db_session=db_session
+                    )
+                    existing_jobs = kickoff_indexing_jobs(
+                        existing_jobs=existing_jobs,
+                        client=client_primary,
+                        get_secondary_client=get_secondary_client,
+                        db_session=db_session,
+                        wakeup=wakeup,
+                    )
         except Exception as e:
             logger.exception(f"Failed to run update due to {e}")
         sleep_time = delay - (time.time() - start)
         if sleep_time > 0:
-            time.sleep(sleep_time)
+            wakeup.wait(timeout=sleep_time)
+        wakeup.clear()
 
 
 def update__main() -> None:
@@ -5,6 +5,7 @@ from sqlalchemy import and_
 from sqlalchemy import func
 from sqlalchemy import select
 from sqlalchemy.orm import aliased
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm import Session
 
 from danswer.configs.constants import DocumentSource
@@ -24,8 +25,12 @@ def fetch_connectors(
     sources: list[DocumentSource] | None = None,
     input_types: list[InputType] | None = None,
     disabled_status: bool | None = None,
+    eager_load_credentials: bool = False,
 ) -> list[Connector]:
     stmt = select(Connector)
+    if eager_load_credentials:
+        # Avoids a lazy load per connector when walking its cc-pairs
+        stmt = stmt.options(selectinload(Connector.credentials))
     if sources is not None:
         stmt = stmt.where(Connector.source.in_(sources))
     if input_types is not None:
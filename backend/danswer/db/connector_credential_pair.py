@@ -4,6 +4,7 @@ from fastapi import HTTPException
 from sqlalchemy import delete
 from sqlalchemy import desc
 from sqlalchemy import select
+from sqlalchemy import tuple_
 from sqlalchemy import update
 from sqlalchemy.orm import Session
 
@@ -132,6 +133,27 @@ def delete_connector_credential_pair__no_commit(
     db_session.execute(stmt)
 
 
+def update_connector_credential_pair_statuses__no_commit(
+    connector_credential_ids: list[tuple[int, int]],
+    attempt_status: IndexingStatus,
+    db_session: Session,
+) -> None:
+    if not connector_credential_ids:
+        return
+
+    stmt = (
+        update(ConnectorCredentialPair)
+        .where(
+            tuple_(
+                ConnectorCredentialPair.connector_id,
+                ConnectorCredentialPair.credential_id,
+            ).in_(connector_credential_ids)
+        )
+        .values(last_attempt_status=attempt_status)
+    )
+    db_session.execute(stmt)
+
+
 def mark_all_in_progress_cc_pairs_failed(
     db_session: Session,
 ) -> None:
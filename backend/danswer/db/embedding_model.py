@@ -60,6 +60,34 @@ def get_secondary_db_embedding_model(db_session: Session) -> EmbeddingModel | No
     return latest_model
 
 
+def get_active_embedding_models(db_session: Session) -> list[EmbeddingModel]:
+    """Fetches the current and (if one exists) the secondary embedding model in a single
+    query. The current model is always first in the returned list"""
+    query = (
+        select(EmbeddingModel)
+        .where(
+            EmbeddingModel.status.in_(
+                [IndexModelStatus.PRESENT, IndexModelStatus.FUTURE]
+            )
+        )
+        .order_by(EmbeddingModel.id.desc())
+    )
+    result = db_session.execute(query)
+
+    latest_models: dict[IndexModelStatus, EmbeddingModel] = {}
+    for model in result.scalars().all():
+        latest_models.setdefault(model.status, model)
+
+    current_model = latest_models.get(IndexModelStatus.PRESENT)
+    if not current_model:
+        raise RuntimeError("No embedding model selected, DB is not in a valid state")
+
+    secondary_model = latest_models.get(IndexModelStatus.FUTURE)
+    if secondary_model is None:
+        return [current_model]
+    return [current_model, secondary_model]
+
+
 def update_embedding_model_status(
     embedding_model: EmbeddingModel, new_status: IndexModelStatus, db_session: Session
 ) -> None:
@@ -22,6 +22,10 @@ logger = setup_logger()
 SYNC_DB_API = "psycopg2"
 ASYNC_DB_API = "asyncpg"
 
+# Recycle connections periodically rather than pinging on every checkout, the
+# long-running background loop already recovers from a failed run on the next one
+POSTGRES_POOL_RECYCLE = 60 * 30  # 30 minutes
+
 # global so we don't create more than one engine per process
 # outside of being best practice, this is needed so we can properly pool
 # connections and not create a new pool on every request
@@ -56,7 +60,11 @@ def get_sqlalchemy_engine() -> Engine:
     global _SYNC_ENGINE
     if _SYNC_ENGINE is None:
         connection_string = build_connection_string(db_api=SYNC_DB_API)
-        _SYNC_ENGINE = create_engine(connection_string)
+        _SYNC_ENGINE = create_engine(
+            connection_string,
+            pool_pre_ping=False,
+            pool_recycle=POSTGRES_POOL_RECYCLE,
+        )
     return _SYNC_ENGINE
 
 
@@ -4,13 +4,17 @@ from sqlalchemy import and_
 from sqlalchemy import ColumnElement
 from sqlalchemy import delete
 from sqlalchemy import desc
+from sqlalchemy import extract
 from sqlalchemy import func
 from sqlalchemy import or_
 from sqlalchemy import select
+from sqlalchemy import tuple_
 from sqlalchemy import update
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import Session
 
+from danswer.db.models import Connector
+from danswer.db.models import ConnectorCredentialPair
 from danswer.db.models import EmbeddingModel
 from danswer.db.models import IndexAttempt
 from danswer.db.models import IndexingStatus
@@ -30,6 +34,23 @@ def get_index_attempt(
     return db_session.scalars(stmt).first()
 
 
+def get_index_attempts_by_ids(
+    index_attempt_ids: list[int], db_session: Session
+) -> list[tuple[int, int | None, int | None, int]]:
+    """Returns (id, connector_id, credential_id, embedding_model_id) for each of the
+    given attempts in a single query, missing IDs are simply not returned"""
+    if not index_attempt_ids:
+        return []
+
+    stmt = select(
+        IndexAttempt.id,
+        IndexAttempt.connector_id,
+        IndexAttempt.credential_id,
+        IndexAttempt.embedding_model_id,
+    ).where(IndexAttempt.id.in_(index_attempt_ids))
+    return list(db_session.execute(stmt).tuples().all())
+
+
 def create_index_attempt(
     connector_id: int,
     credential_id: int,
@@ -110,6 +131,40 @@ def mark_attempt_failed(
     optional_telemetry(record_type=RecordType.FAILURE, data={"connector": source})
 
 
+def mark_attempts_failed(
+    failed_attempts: list[tuple[IndexAttempt, str]],
+    db_session: Session,
+) -> None:
+    """Bulk version of `mark_attempt_failed`, takes (index_attempt, failure_reason)
+    pairs and updates all of them in a single statement + commit"""
+    if not failed_attempts:
+        return
+
+    # grab these before the commit expires the attempts
+    sources = [
+        index_attempt.connector.source
+        for index_attempt, _ in failed_attempts
+        if index_attempt.connector is not None
+    ]
+
+    db_session.execute(
+        update(IndexAttempt),
+        [
+            {
+                "id": index_attempt.id,
+                "status": IndexingStatus.FAILED,
+                "error_msg": failure_reason,
+                "full_exception_trace": None,
+            }
+            for index_attempt, failure_reason in failed_attempts
+        ],
+    )
+    db_session.commit()
+
+    for source in sources:
+        optional_telemetry(record_type=RecordType.FAILURE, data={"connector": source})
+
+
 def update_docs_indexed(
     db_session: Session,
     index_attempt: IndexAttempt,
@@ -140,6 +195,39 @@ def get_last_attempt(
     return db_session.execute(stmt).scalars().first()
 
 
+def get_last_attempts_bulk(
+    connector_credential_model_ids: list[tuple[int, int, int]],
+    db_session: Session,
+) -> dict[tuple[int | None, int | None, int], IndexAttempt]:
+    """Same as `get_last_attempt` but for many (connector_id, credential_id,
+    embedding_model_id) triples at once, uses Postgres DISTINCT ON to only return the
+    latest attempt of each group"""
+    if not connector_credential_model_ids:
+        return {}
+
+    group_columns = (
+        IndexAttempt.connector_id,
+        IndexAttempt.credential_id,
+        IndexAttempt.embedding_model_id,
+    )
+    stmt = (
+        select(IndexAttempt)
+        .where(tuple_(*group_columns).in_(connector_credential_model_ids))
+        .distinct(*group_columns)
+        # Note, the below is using time_created instead of time_updated
+        .order_by(*group_columns, desc(IndexAttempt.time_created))
+    )
+
+    return {
+        (
+            attempt.connector_id,
+            attempt.credential_id,
+            attempt.embedding_model_id,
+        ): attempt
+        for attempt in db_session.scalars(stmt).all()
+    }
+
+
 def get_latest_index_attempts(
     connector_credential_pair_identifiers: list[ConnectorCredentialPairIdentifier],
     secondary_index: bool,
@@ -266,6 +354,60 @@ def cancel_indexing_attempts_for_connector(
     db_session.commit()
 
 
+def has_pending_or_due_indexing(db_session: Session) -> bool:
+    """Cheap check for whether the background indexing loop has anything to do, i.e.
+    there are queued / running attempts, an embedding model switch over is underway or
+    an enabled cc-pair is due to be re-indexed. Should never miss anything that would
+    lead to new attempts being created"""
+    pending = (
+        select(IndexAttempt.id)
+        .where(
+            IndexAttempt.status.in_(
+                [IndexingStatus.NOT_STARTED, IndexingStatus.IN_PROGRESS]
+            )
+        )
+        .exists()
+    )
+
+    switching_models = (
+        select(EmbeddingModel.id)
+        .where(EmbeddingModel.status == IndexModelStatus.FUTURE)
+        .exists()
+    )
+
+    # Note, same as `get_last_attempt`, this is using time_created to find the latest
+    last_attempt_time_updated = (
+        select(IndexAttempt.time_updated)
+        .join(EmbeddingModel, IndexAttempt.embedding_model_id == EmbeddingModel.id)
+        .where(
+            IndexAttempt.connector_id == ConnectorCredentialPair.connector_id,
+            IndexAttempt.credential_id == ConnectorCredentialPair.credential_id,
+            EmbeddingModel.status == IndexModelStatus.PRESENT,
+        )
+        .order_by(desc(IndexAttempt.time_created))
+        .limit(1)
+        .correlate(ConnectorCredentialPair)
+        .scalar_subquery()
+    )
+    due_cc_pairs = (
+        select(ConnectorCredentialPair.id)
+        .join(Connector, ConnectorCredentialPair.connector_id == Connector.id)
+        .where(
+            Connector.disabled == False,  # noqa: E712
+            Connector.refresh_freq.is_not(None),
+            or_(
+                last_attempt_time_updated.is_(None),
+                extract("epoch", func.now() - last_attempt_time_updated)
+                >= Connector.refresh_freq,
+            ),
+        )
+        .exists()
+    )
+
+    stmt = select(or_(pending, switching_models, due_cc_pairs))
+    return bool(db_session.scalar(stmt))
+
+
 def count_unique_cc_pairs_with_index_attempts(
     embedding_model_id: int | None,
     db_session: Session,
@@ -0,0 +1,58 @@
+import threading
+import time
+import unittest
+
+from danswer.background.indexing.job_client import SimpleJob
+from danswer.background.indexing.job_client import SimpleJobClient
+
+
+def _sleep(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+class TestSimpleJobClient(unittest.TestCase):
+    def test_map_returns_none_without_free_workers(self) -> None:
+        client = SimpleJobClient(n_workers=1)
+        jobs = client.map(_sleep, [5, 5], pure=False)
+        try:
+            self.assertEqual(len(jobs), 2)
+            self.assertIsNotNone(jobs[0])
+            self.assertIsNone(jobs[1])
+        finally:
+            for job in jobs:
+                if job is not None:
+                    job.release()
+
+    def test_done_callback_fires_after_exit(self) -> None:
+        client = SimpleJobClient(n_workers=1)
+        job = client.submit(_sleep, 0.1, pure=False)
+        assert job is not None
+
+        called_with: list[SimpleJob] = []
+        callback_fired = threading.Event()
+
+        def _callback(finished_job: SimpleJob) -> None:
+            called_with.append(finished_job)
+            callback_fired.set()
+
+        job.add_done_callback(_callback)
+
+        self.assertTrue(callback_fired.wait(timeout=10))
+        self.assertEqual(called_with, [job])
+        # the sentinel fires as the child exits, it may not be reaped quite yet
+        deadline = time.time() + 5
+        while not job.done() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(job.done())
+
+    def test_done_callback_fires_immediately_without_process(self) -> None:
+        job = SimpleJob(id=0)
+        called_with: list[SimpleJob] = []
+
+        job.add_done_callback(called_with.append)
+
+        self.assertEqual(called_with, [job])
+
+
+if __name__ == "__main__":
+    unittest.main()